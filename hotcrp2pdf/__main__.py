@@ -40,9 +40,11 @@ def cli(ctx, tmp_dir: Path, verbose: bool):
               help='Exclude author information from the PDF')
 @click.option('--title', default='Talk Submissions',
               help='Title for the document (default: "Talk Submissions")')
+@click.option('--resume', is_flag=True,
+              help='Continue from the build journal, re-rendering only missing, corrupt or failed talks')
 @click.pass_context
 def convert(ctx, submissions_json: Path, output_pdf: Path, 
-        no_authors: bool, title: str):
+        no_authors: bool, title: str, resume: bool):
     """Convert HotCRP talk submissions to PDF document.
     
     SUBMISSIONS_JSON: Path to the HotCRP submissions JSON file
@@ -65,7 +67,8 @@ def convert(ctx, submissions_json: Path, output_pdf: Path,
         json_file=submissions_json,
         output_pdf=output_pdf,
         include_authors=include_authors,
-        title=title
+        title=title,
+        resume=resume
     )
     
     if success:
@@ -96,8 +99,10 @@ def clear(ctx):
 @click.argument('abstracts_txt', type=click.Path(exists=True, path_type=Path))
 @click.argument('output_pdf', type=click.Path(path_type=Path))
 @click.option('--title', default='Talk Abstracts', help='Title for the document (default: "Talk Abstracts")')
+@click.option('--resume', is_flag=True,
+              help='Continue from the build journal, re-rendering only missing, corrupt or failed talks')
 @click.pass_context
-def convert_abstracts(ctx, abstracts_txt: Path, output_pdf: Path, title: str):
+def convert_abstracts(ctx, abstracts_txt: Path, output_pdf: Path, title: str, resume: bool):
     """Convert abstracts.txt to PDF document."""
     tmp_dir = ctx.obj['tmp_dir']
     verbose = ctx.obj['verbose']
@@ -114,7 +119,8 @@ def convert_abstracts(ctx, abstracts_txt: Path, output_pdf: Path, title: str):
         talks=talks,
         output_pdf=output_pdf,
         include_authors=False,
-        title=title
+        title=title,
+        resume=resume
     )
 
     if success:
@@ -6,11 +6,14 @@ import json
 import subprocess
 import tempfile
 import os
+import threading
 import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple
-from .models import Talk
+from .models import Talk, strip_html_tags
+from . import pandoc_ast as ast
+from .journal import BuildJournal, sha256_text
 import re
 
 def get_tmp_dir() -> Path:
@@ -46,6 +49,8 @@ class HotCRPConverter:
             '-V', 'toccolor=blue',
             '-V', 'maxlistdepth=10'
         ]
+        self._pandoc_api_version = None
+        self._pandoc_api_lock = threading.Lock()
     
     def _run_pandoc(self, input_file: Path, output_file: Path, extra_flags: List[str] = None) -> bool:
         """Run pandoc with standard flags and optional extra flags."""
@@ -66,6 +71,24 @@ class HotCRPConverter:
             print("Error: pandoc not found. Please install pandoc.")
             return False
     
+    def _get_pandoc_api_version(self) -> Optional[List[int]]:
+        """Get the JSON AST API version spoken by the installed pandoc."""
+        with self._pandoc_api_lock:
+            if self._pandoc_api_version is None:
+                try:
+                    result = subprocess.run(['pandoc', '-f', 'markdown', '-t', 'json'],
+                                            input='', capture_output=True, text=True, check=True)
+                    self._pandoc_api_version = json.loads(result.stdout)['pandoc-api-version']
+                except (subprocess.CalledProcessError, FileNotFoundError, ValueError, KeyError) as e:
+                    print(f"Error determining pandoc API version: {e}")
+                    return None
+            return self._pandoc_api_version
+    
+    def _write_pandoc_ast(self, doc: dict, json_file: Path):
+        """Write a pandoc JSON AST document to disk."""
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(doc, f, ensure_ascii=False)
+    
     def _get_pdf_page_count(self, pdf_file: Path) -> int:
         """Get the number of pages in a PDF file."""
         try:
@@ -157,16 +180,24 @@ class HotCRPConverter:
     
     def generate_toc(self, talks: List[Talk]) -> Optional[Path]:
         """Generate table of contents PDF."""
-        toc_md = self.tmp_dir / "toc.md"
+        toc_json = self.tmp_dir / "toc.json"
         toc_pdf = self.tmp_dir / "toc.pdf"
         
-        with open(toc_md, 'w') as f:
-            f.write("# Table of Contents\n\n")
-            for talk in sorted(talks, key=lambda t: t.pid):
-                title_clean = talk.title.replace('#', '').strip()
-                f.write(f"* [{talk.pid}. {title_clean}](#submission-{talk.pid})\n")
+        api_version = self._get_pandoc_api_version()
+        if not api_version:
+            return None
         
-        if self._run_pandoc(toc_md, toc_pdf):
+        items = [
+            [ast.plain([ast.link(ast.text(f"{talk.pid}. {strip_html_tags(talk.title)}"),
+                                 f"#submission-{talk.pid}")])]
+            for talk in sorted(talks, key=lambda t: t.pid)
+        ]
+        blocks = [ast.header(1, ast.text("Table of Contents"))]
+        if items:
+            blocks.append(ast.bullet_list(items))
+        self._write_pandoc_ast(ast.document(blocks, api_version), toc_json)
+        
+        if self._run_pandoc(toc_json, toc_pdf, ['-f', 'json']):
             # Ensure odd number of pages
             pages = self._get_pdf_page_count(toc_pdf)
             if pages % 2 == 0:
@@ -174,23 +205,105 @@ class HotCRPConverter:
             return toc_pdf
         return None
     
-    def generate_talk_pdf(self, talk: Talk, include_authors: bool) -> Optional[Path]:
-        """Generate PDF for a single talk."""
-        talk_md = self.talks_dir / f"talk_{talk.pid}.md"
+    def generate_talk_pdf(self, talk: Talk, include_authors: bool,
+                          journal: Optional[BuildJournal] = None) -> Optional[Path]:
+        """Generate PDF for a single talk, checkpointing the result in the journal."""
+        talk_json = self.talks_dir / f"talk_{talk.pid}.json"
         talk_pdf = self.talks_dir / f"talk_{talk.pid}.pdf"
+        partial_pdf = self.talks_dir / f"talk_{talk.pid}.partial.pdf"
+        
+        api_version = self._get_pandoc_api_version()
+        if not api_version:
+            if journal:
+                journal.record_failure(talk.pid)
+            return None
+        
+        doc = talk.render_pandoc_ast(include_authors=include_authors, api_version=api_version)
+        inputs = sha256_text(json.dumps([doc, self.pandoc_flags], sort_keys=True))
         
-        if talk_pdf.exists():
-            print(f"Using cached PDF for talk {talk.pid}")
+        if journal and journal.is_complete(talk.pid, inputs, talk_pdf):
+            print(f"Using checkpointed PDF for talk {talk.pid}")
             return talk_pdf
         
-        with open(talk_md, 'w') as f:
-            f.write(talk.render_markdown(include_authors=include_authors))
+        self._write_pandoc_ast(doc, talk_json)
         
-        if self._run_pandoc(talk_md, talk_pdf):
-            self._ensure_pdf_pages(talk_pdf, 2)  # Ensure exactly 2 pages
+        # Render under a temporary name so an interrupted run never leaves
+        # a half-written talk_{pid}.pdf behind
+        if (self._run_pandoc(talk_json, partial_pdf, ['-f', 'json'])
+                and self._ensure_pdf_pages(partial_pdf, 2)):  # Ensure exactly 2 pages
+            os.replace(partial_pdf, talk_pdf)
+            if journal:
+                journal.record_success(talk.pid, inputs, talk_pdf)
             return talk_pdf
+        if journal:
+            journal.record_failure(talk.pid, inputs)
+        partial_pdf.unlink(missing_ok=True)
         return None
     
+    def generate_talk_pdfs(self, talks: List[Talk], include_authors: bool,
+                           resume: bool = False) -> List[Path]:
+        """Generate talk PDFs in parallel and return them sorted by PID.
+        
+        Progress is recorded in a build journal in tmp_dir. With resume=True,
+        talks whose PDF is checkpointed and intact are reused and everything
+        else, including previously failed talks, is rendered again.
+        """
+        journal = BuildJournal(self.tmp_dir / "journal.jsonl", resume=resume)
+        if resume:
+            failed = journal.failed_pids()
+            completed = sum(1 for e in journal.entries.values() if e.get('status') == 'ok')
+            print(f"Resuming from {journal.path} ({completed} checkpointed talks, "
+                  f"{len(failed)} previously failed: {failed})")
+        
+        talk_pdfs = []
+        failed_talks = []
+        
+        # Use ThreadPoolExecutor for parallel processing
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # Submit all tasks
+            future_to_talk = {
+                executor.submit(self.generate_talk_pdf, talk, include_authors, journal): talk
+                for talk in talks
+            }
+            
+            # Process results as they complete
+            for future in concurrent.futures.as_completed(future_to_talk):
+                talk = future_to_talk[future]
+                try:
+                    talk_pdf = future.result()
+                    if talk_pdf:
+                        talk_pdfs.append((talk.pid, talk_pdf))  # Store PID with PDF path
+                        print(f"✓ Generated PDF for talk {talk.pid}")
+                    else:
+                        failed_talks.append(talk.pid)
+                        print(f"✗ Failed to generate PDF for talk {talk.pid}")
+                except Exception as e:
+                    failed_talks.append(talk.pid)
+                    journal.record_failure(talk.pid)
+                    print(f"✗ Error processing talk {talk.pid}: {e}")
+        
+        if failed_talks:
+            print(f"Warning: Failed to generate PDFs for {len(failed_talks)} talks: {sorted(failed_talks)}")
+            print(f"Rerun with --resume to retry them (journal: {journal.path})")
+        
+        # Sort talk PDFs by PID before concatenating
+        talk_pdfs.sort(key=lambda x: x[0])  # Sort by PID
+        return [pdf for _, pdf in talk_pdfs]  # Extract just the PDF paths
+    
+    def concatenate_pdfs(self, pdf_files: List[Path], output_pdf: Path) -> bool:
+        """Concatenate PDFs into output_pdf, replacing it only once pdfunite succeeds."""
+        partial_output = output_pdf.with_name(output_pdf.name + '.partial')
+        cmd = ['pdfunite'] + [str(p) for p in pdf_files] + [str(partial_output)]
+        try:
+            subprocess.run(cmd, check=True)
+            os.replace(partial_output, output_pdf)
+            print(f"Successfully created {output_pdf}")
+            return True
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"Error concatenating PDFs: {e}")
+            partial_output.unlink(missing_ok=True)
+            return False
+    
     def load_submissions(self, json_file: Path) -> List[Talk]:
         """Load talk submissions from JSON file."""
         with open(json_file, 'r', encoding='utf-8') as f:
@@ -207,7 +320,8 @@ class HotCRPConverter:
         return talks
     
     def convert(self, json_file: Path, output_pdf: Path, 
-                include_authors: bool = True, title: str = "Talk Submissions") -> bool:
+                include_authors: bool = True, title: str = "Talk Submissions",
+                resume: bool = False) -> bool:
         """Convert HotCRP submissions JSON to PDF with specific page requirements."""
         # Load submissions
         print(f"Loading submissions from {json_file}...")
@@ -232,50 +346,11 @@ class HotCRPConverter:
         
         # Generate individual talk PDFs in parallel
         print("Generating talk PDFs in parallel...")
-        talk_pdfs = []
-        failed_talks = []
-        
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-            # Submit all tasks
-            future_to_talk = {
-                executor.submit(self.generate_talk_pdf, talk, include_authors): talk
-                for talk in talks
-            }
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_talk):
-                talk = future_to_talk[future]
-                try:
-                    talk_pdf = future.result()
-                    if talk_pdf:
-                        talk_pdfs.append((talk.pid, talk_pdf))  # Store PID with PDF path
-                        print(f"✓ Generated PDF for talk {talk.pid}")
-                    else:
-                        failed_talks.append(talk.pid)
-                        print(f"✗ Failed to generate PDF for talk {talk.pid}")
-                except Exception as e:
-                    failed_talks.append(talk.pid)
-                    print(f"✗ Error processing talk {talk.pid}: {e}")
-        
-        if failed_talks:
-            print(f"Warning: Failed to generate PDFs for {len(failed_talks)} talks: {failed_talks}")
-        
-        # Sort talk PDFs by PID before concatenating
-        talk_pdfs.sort(key=lambda x: x[0])  # Sort by PID
-        sorted_talk_pdfs = [pdf for _, pdf in talk_pdfs]  # Extract just the PDF paths
+        sorted_talk_pdfs = self.generate_talk_pdfs(talks, include_authors, resume=resume)
         
         # Concatenate all PDFs
         print("Concatenating PDFs...")
-        pdf_files = [str(title_pdf), str(toc_pdf)] + [str(p) for p in sorted_talk_pdfs]
-        cmd = ['pdfunite'] + pdf_files + [str(output_pdf)]            
-        try:
-            subprocess.run(cmd, check=True)
-            print(f"Successfully created {output_pdf}")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Error concatenating PDFs: {e}")
-            return False
+        return self.concatenate_pdfs([title_pdf, toc_pdf] + sorted_talk_pdfs, output_pdf)
 
     def parse_abstracts(self, abstracts_file: Path) -> list:
         """Parse abstracts.txt and return a list of Talk objects."""
@@ -316,7 +391,7 @@ class HotCRPConverter:
             talks.append(talk)
         return talks
 
-    def convert_from_talks(self, talks, output_pdf, include_authors=True, title="Talk Submissions"):
+    def convert_from_talks(self, talks, output_pdf, include_authors=True, title="Talk Submissions", resume=False):
         """Convert a list of Talk objects to PDF with specific page requirements."""
         print(f"Loaded {len(talks)} submissions")
         if not talks:
@@ -337,43 +412,8 @@ class HotCRPConverter:
 
         # Generate individual talk PDFs in parallel
         print("Generating talk PDFs in parallel...")
-        talk_pdfs = []
-        failed_talks = []
-
-        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-            future_to_talk = {
-                executor.submit(self.generate_talk_pdf, talk, include_authors): talk
-                for talk in talks
-            }
-            for future in concurrent.futures.as_completed(future_to_talk):
-                talk = future_to_talk[future]
-                try:
-                    talk_pdf = future.result()
-                    if talk_pdf:
-                        talk_pdfs.append((talk.pid, talk_pdf))
-                        print(f"✓ Generated PDF for talk {talk.pid}")
-                    else:
-                        failed_talks.append(talk.pid)
-                        print(f"✗ Failed to generate PDF for talk {talk.pid}")
-                except Exception as e:
-                    failed_talks.append(talk.pid)
-                    print(f"✗ Error processing talk {talk.pid}: {e}")
-
-        if failed_talks:
-            print(f"Warning: Failed to generate PDFs for {len(failed_talks)} talks: {failed_talks}")
-
-        # Sort talk PDFs by PID before concatenating
-        talk_pdfs.sort(key=lambda x: x[0])
-        sorted_talk_pdfs = [pdf for _, pdf in talk_pdfs]
+        sorted_talk_pdfs = self.generate_talk_pdfs(talks, include_authors, resume=resume)
 
         # Concatenate all PDFs
         print("Concatenating PDFs...")
-        pdf_files = [str(title_pdf), str(toc_pdf)] + [str(p) for p in sorted_talk_pdfs]
-        cmd = ['pdfunite'] + pdf_files + [str(output_pdf)]
-        try:
-            subprocess.run(cmd, check=True)
-            print(f"Successfully created {output_pdf}")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Error concatenating PDFs: {e}")
-            return False
\ No newline at end of file
+        return self.concatenate_pdfs([title_pdf, toc_pdf] + sorted_talk_pdfs, output_pdf)
\ No newline at end of file
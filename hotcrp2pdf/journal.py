@@ -0,0 +1,102 @@
+"""
+Append-only build journal for resumable conversions
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def sha256_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    """Return the hex SHA-256 digest of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class BuildJournal:
+    """Record the outcome of each talk render as one JSON line per event.
+
+    Entries are only ever appended; when a pid appears more than once the
+    latest entry wins. A line truncated by a crash is ignored on load.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        """Open the journal, discarding previous entries unless resuming."""
+        self.path = path
+        self.entries: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+        if resume:
+            self._load()
+        else:
+            self.path.write_text('')
+
+    def _load(self):
+        """Replay existing journal entries."""
+        if not self.path.exists():
+            return
+        content = self.path.read_text(encoding='utf-8')
+        for line in content.splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict) and 'pid' in entry:
+                self.entries[entry['pid']] = entry
+        # Terminate a line cut short by a crash so new entries start cleanly
+        if content and not content.endswith('\n'):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n')
+
+    def _append(self, entry: dict):
+        """Durably append a single entry to the journal."""
+        line = json.dumps(entry, sort_keys=True) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries[entry['pid']] = entry
+
+    def record_success(self, pid: int, inputs: str, output: Path):
+        """Checkpoint a rendered talk together with the checksum of its PDF."""
+        self._append({
+            'pid': pid,
+            'status': 'ok',
+            'inputs': inputs,
+            'output': str(output),
+            'sha256': sha256_file(output),
+        })
+
+    def record_failure(self, pid: int, inputs: Optional[str] = None):
+        """Record that rendering a talk failed."""
+        self._append({
+            'pid': pid,
+            'status': 'failed',
+            'inputs': inputs,
+        })
+
+    def is_complete(self, pid: int, inputs: str, output: Path) -> bool:
+        """Check whether a talk was rendered from the same inputs and is intact on disk."""
+        entry = self.entries.get(pid)
+        if not entry or entry.get('status') != 'ok':
+            return False
+        if entry.get('inputs') != inputs or entry.get('output') != str(output):
+            return False
+        if not output.exists():
+            return False
+        return sha256_file(output) == entry.get('sha256')
+
+    def failed_pids(self) -> list:
+        """Return the pids whose latest entry is a failure."""
+        return sorted(pid for pid, e in self.entries.items() if e.get('status') == 'failed')
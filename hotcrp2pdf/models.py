@@ -5,6 +5,7 @@ Data models for HotCRP submissions
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Any
 from jinja2 import Template
+from . import pandoc_ast as ast
 import html
 import re
 
@@ -170,4 +171,53 @@ class Talk:
             'include_authors': include_authors
         }
         
-        return template.render(**data).strip() 
\ No newline at end of file
+        return template.render(**data).strip()
+
+    def render_pandoc_ast(self, include_authors=True, api_version: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Render the talk as a pandoc JSON AST document.
+
+        Submitter text is emitted as literal strings, so pandoc never has to
+        parse (or escape) it as markdown.
+        """
+        blocks = [ast.header(1, ast.text(f"#{self.pid} {strip_html_tags(self.title)}"),
+                             identifier=f"submission-{self.pid}")]
+
+        if include_authors:
+            blocks.append(ast.header(2, ast.text("Speakers")))
+            items = []
+            for author in self.authors:
+                name = f"{author.first} {author.last}"
+                if author.affiliation:
+                    name += f" ({author.affiliation})"
+                items.append([ast.plain(ast.text(name))])
+            if items:
+                blocks.append(ast.bullet_list(items))
+
+        proposal_length = strip_html_tags(self.proposal_length)
+        if proposal_length:
+            blocks.append(ast.header(2, ast.text("Duration")))
+            blocks.append(ast.para([ast.emph(ast.text(proposal_length))]))
+
+        if self.tags:
+            blocks.append(ast.header(2, ast.text("Tags")))
+            inlines = []
+            for i, tag in enumerate(self.tags):
+                if i:
+                    inlines += ast.text(',') + [ast.space()]
+                inlines.append(ast.code(tag.tag))
+            blocks.append(ast.para(inlines))
+
+        sections = [
+            ("Description", self.long_description_program_committee),
+            ("Session Outline", self.session_outline),
+            ("Audience Take-aways", self.audience_take_aways),
+            ("Program Committee Notes", self.other_notes_program_committee_chairs),
+        ]
+        for heading, value in sections:
+            value = strip_html_tags(value)
+            if value:
+                blocks.append(ast.header(2, ast.text(heading)))
+                blocks.extend(ast.paragraphs(value))
+
+        blocks.append(ast.horizontal_rule())
+        return ast.document(blocks, api_version)
@@ -0,0 +1,114 @@
+"""
+Helpers for building pandoc JSON AST documents
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+# Lines that keep a hard break before them, e.g. a numbered session outline
+LIST_ITEM = re.compile(r'\s*(\d+[.)]|[-*+])\s')
+
+
+def attr(identifier: str = "", classes: Sequence[str] = ()) -> list:
+    """Build an element attribute triple (identifier, classes, key-value pairs)."""
+    return [identifier, list(classes), []]
+
+
+def space() -> dict:
+    """Build an inter-word space."""
+    return {'t': 'Space'}
+
+
+def soft_break() -> dict:
+    """Build a soft line break, which the writer reflows like a space."""
+    return {'t': 'SoftBreak'}
+
+
+def line_break() -> dict:
+    """Build a hard line break."""
+    return {'t': 'LineBreak'}
+
+
+def text(value: str) -> List[dict]:
+    """Convert literal text to inlines, collapsing all whitespace into spaces.
+
+    Every word becomes a Str node, so markdown and LaTeX metacharacters are
+    never interpreted and are escaped by pandoc's writer instead.
+    """
+    inlines = []
+    for i, word in enumerate(value.split()):
+        if i:
+            inlines.append(space())
+        inlines.append({'t': 'Str', 'c': word})
+    return inlines
+
+
+def lines(value: str) -> List[dict]:
+    """Convert literal multi-line text to inlines.
+
+    Lines are joined with soft breaks so hard-wrapped prose reflows; lines
+    that start with a list marker (e.g. a numbered outline) keep a hard
+    break. Empty lines are skipped.
+    """
+    inlines = []
+    for line in value.split('\n'):
+        if not line.strip():
+            continue
+        if inlines:
+            inlines.append(line_break() if LIST_ITEM.match(line) else soft_break())
+        inlines.extend(text(line))
+    return inlines
+
+
+def emph(inlines: List[dict]) -> dict:
+    """Build emphasized inlines."""
+    return {'t': 'Emph', 'c': inlines}
+
+
+def code(value: str) -> dict:
+    """Build inline code."""
+    return {'t': 'Code', 'c': [attr(), value]}
+
+
+def link(inlines: List[dict], target: str) -> dict:
+    """Build a link to target."""
+    return {'t': 'Link', 'c': [attr(), inlines, [target, ""]]}
+
+
+def header(level: int, inlines: List[dict], identifier: str = "") -> dict:
+    """Build a section header."""
+    return {'t': 'Header', 'c': [level, attr(identifier), inlines]}
+
+
+def para(inlines: List[dict]) -> dict:
+    """Build a paragraph."""
+    return {'t': 'Para', 'c': inlines}
+
+
+def plain(inlines: List[dict]) -> dict:
+    """Build a plain block, i.e. a paragraph without spacing (used in lists)."""
+    return {'t': 'Plain', 'c': inlines}
+
+
+def bullet_list(items: List[List[dict]]) -> dict:
+    """Build a bullet list; each item is a list of blocks."""
+    return {'t': 'BulletList', 'c': items}
+
+
+def horizontal_rule() -> dict:
+    """Build a horizontal rule."""
+    return {'t': 'HorizontalRule'}
+
+
+def paragraphs(value: str) -> List[dict]:
+    """Split literal text on blank lines into Para blocks."""
+    return [para(lines(p)) for p in re.split(r'\n\s*\n', value) if p.strip()]
+
+
+def document(blocks: List[dict], api_version: Optional[List[int]] = None) -> dict:
+    """Wrap blocks in a pandoc document for the given pandoc API version."""
+    return {
+        'pandoc-api-version': api_version or [1, 23, 1],
+        'meta': {},
+        'blocks': blocks,
+    }